@@ -0,0 +1,45 @@
+"""Recursion-guard primitives shared by the inference hot paths."""
+
+# Golden-ratio multiplier spreading sequential object ids over the whole
+# 64-bit key space before they are folded with the name hash.
+_MIX = 0x9E3779B97F4A7C15
+_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+def guard_key(node, name):
+    """Mix a node/name pair into a single 64-bit guard key."""
+    return ((id(node) * _MIX) & _MASK) ^ (hash(name) & _MASK)
+
+
+class RecursionGuard:
+    """Membership guard with a single add-and-test entry point.
+
+    Backed by a plain set of int keys; the one-call interface matches an
+    open-addressed table so a compiled drop-in could replace this
+    implementation without touching callers. InferenceContext.path and
+    has_known_bases route their membership checks through it.
+    """
+
+    __slots__ = ("_keys",)
+
+    def __init__(self, keys=None) -> None:
+        self._keys = set() if keys is None else keys
+
+    def add_and_test(self, key) -> bool:
+        """Record *key*; return True if it was already present."""
+        keys = self._keys
+        if key in keys:
+            return True
+        keys.add(key)
+        return False
+
+    def copy(self) -> "RecursionGuard":
+        """Return an independent guard seeded with the recorded keys."""
+        return RecursionGuard(self._keys.copy())
+
+    def clear(self) -> None:
+        """Forget every recorded key."""
+        self._keys.clear()
+
+    def __len__(self) -> int:
+        return len(self._keys)
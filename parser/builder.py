@@ -1,18 +1,64 @@
 import ast
-from fileinput import filename
-from msilib import datasizemask
-from msilib.schema import Error
-from multiprocessing import Manager
+import copy
+import functools
+import hashlib
+import io
+import itertools
 import os
-from readline import insert_text
-from signal import pthread_kill
-from sqlite3 import InterfaceError
+import re
+import sys
 import textwrap
-from tkinter import _Compound
-from typing import Union, Optional
+import tokenize
+from collections import OrderedDict, deque
+from typing import Optional
+
 from parser.manager import Manager
 
 
+@functools.lru_cache(maxsize=1024)
+def _cached_isfile(path):
+    """One cached stat per candidate path.
+
+    The same module path is probed many times during a linter-style run,
+    so the stat result is remembered instead of hitting the filesystem
+    each time.
+    """
+    return os.path.isfile(path)
+
+
+def _instance_iattrs(inferred, node):
+    """Delayed-assattr handler for exact Instance/ExceptionInstance values."""
+    inferred = inferred._proxied
+    if not _can_assign_attr(inferred, node.attrname):
+        return None
+    return inferred.instance_attrs
+
+
+def _import_from_sort_key(node) -> int:
+    """Sort key for locals ordering; tolerates a missing fromlineno."""
+    return node.fromlineno or 0
+
+
+# Explicitly interned so the dict/string machinery can take the pointer
+# identity shortcut when comparing module names against it.
+_FUTURE = sys.intern("__future__")
+
+_STATEMENT_SELECTOR = "#@"
+# Matches a selector comment at end of line (trailing blanks allowed), so
+# the whole scan runs inside the C regex engine instead of a Python loop
+# over stripped line copies.
+_STATEMENT_SELECTOR_RE = re.compile(
+    re.escape(_STATEMENT_SELECTOR.encode("utf-8")) + rb"[ \t]*$", re.MULTILINE
+)
+# Cheap pre-filter for sources that may contain type comments at all; see
+# _parse_string.
+_TYPE_COMMENT_RE = re.compile(rb"#\s*type:")
+# Direct binding to the stdlib compiler entry point for the common parse
+# path; the wrapper returned by get_parser_module is only resolved once.
+_AST_PARSE = ast.parse
+_default_parser_module = None
+
+
 class Builder:
     """Class for building an ast tree from source code or from a live module.
 
@@ -25,6 +71,9 @@ class Builder:
 
     def __init__(self, manager=None, apply_transforms=True):
         self._apply_transforms = apply_transforms
+        # Built lazily on first use since the node classes it keys on are
+        # resolved at runtime; see _assattr_iattrs.
+        self._assattr_dispatch = None
 
     def module_build(self, module, modname=None):
         """Build an ast from a living module instance."""
@@ -40,8 +89,10 @@ class Builder:
                 node = self.string_build(source, modname, path=path)
         if node is None and path is not None:
             path_, ext = os.path.splitext(modutils._path_from_filename(path))
-            if ext in {".py", ".pyc", ".pyo"} and os.path.exists(path_, +".py"):
-                node = self.file_build(path_ + ".py", modname)
+            if ext in {".py", ".pyc", ".pyo"}:
+                candidate = path_ + ".py"
+                if _cached_isfile(candidate):
+                    node = self.file_build(candidate, modname)
         if node is None:
             # this is a built-in module
             # get a partial representation by introspection
@@ -90,6 +141,21 @@ class Builder:
             # build astroid representation
             module, builder = self._data_build(module, builder, encoding)
 
+    def files_build(self, paths):
+        """Build asts for several independent source files in parallel.
+
+        Parsing is CPU-bound under the GIL, so the files are distributed
+        over a process pool; each worker builds with a fresh Builder since
+        the manager state does not pickle. Returns a dict mapping each
+        path to its built module, in the order of *paths*.
+        """
+        # pylint: disable=import-outside-toplevel; keep startup lean
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            # chunksize amortizes the IPC cost over several files per task.
+            return dict(zip(paths, executor.map(_parse_one_file, paths, chunksize=8)))
+
     def string_build(self, data, modname="", path=None):
         """Build ast from source code string."""
         module, builder = self._data_build(data, modname, path)
@@ -101,14 +167,25 @@ class Builder:
         module.file_encoding = encoding
         self._manager.cache_module(module)
         # post tree building steps after we stored the module in the cache:
-        for from_node in builder._import_from_nodes:
-            if from_node.modname == "__future__":
-                for symbol, _ in from_node.names:
-                    module.future_imports.add(symbol)
-            self.add_from_names_to_locals(from_node)
-        # Handle delayed assattr nodes
-        for delayed in builder._delayed_assattr:
-            self.delayed_assattr(delayed)
+        # import-from handling and delayed assattr nodes run as one fused
+        # loop, with the per-iteration attribute lookups hoisted into locals.
+        # Inference results are shared across the pass: many delayed nodes
+        # target the same expression (typically `self`), so each distinct
+        # expression is only inferred once.
+        add_from = self.add_from_names_to_locals
+        delayed_fn = self.delayed_assattr
+        future_update = module.future_imports.update
+        infer_cache = {}
+        for is_delayed, delayed_node in itertools.chain(
+            ((False, node) for node in builder._import_from_nodes),
+            ((True, node) for node in builder._delayed_assattr),
+        ):
+            if is_delayed:
+                delayed_fn(delayed_node, infer_cache)
+            else:
+                if delayed_node.modname == _FUTURE:
+                    future_update(symbol for symbol, _ in delayed_node.names)
+                add_from(delayed_node)
 
         # Visit the transforms
         if self._apply_transforms:
@@ -135,11 +212,12 @@ class Builder:
         if modname.endswith("__init__"):
             modname = modname[:-9]
             package = True
+        elif path is None:
+            package = False
         else:
-            package = (
-                path is not None
-                and os.path.splitext(os.path.basename(path))[0] == "__init__"
-            )
+            # Single basename/extension derivation instead of the chained
+            # splitext(basename(...)) string ops.
+            package = os.path.basename(path).rpartition(".")[0] == "__init__"
         builder = rebuilder.TreeRebuilder(self._manager, parser_module, data)
         module = builder.visit_module(node, modname, node_file, package)
         return module, builder
@@ -149,14 +227,13 @@ class Builder:
 
         Restore the locals id coming from a delayed node.
         """
-
-        def _key_func(node) -> int:
-            return node.fromlineno or 0
-
-        def sort_locals(my_list) -> None:
-            my_list.sort(key=_key_func)
-
         assert node.parent  # It should always default to the module
+        # scope() walks the parent chain, so resolve it (and the other
+        # per-iteration attribute lookups) once per import-from node.
+        parent = node.parent
+        set_local = parent.set_local
+        scope_locals = parent.scope().locals
+        touched = set()
         for (name, asname) in node.names:
             if name == "*":
                 try:
@@ -164,55 +241,86 @@ class Builder:
                 except ValueError:
                     continue
                 for name in imported.public_name():
-                    node.parent.set_local(name, node)
-                    sort_locals(node.parent.scope().locals[name])
+                    set_local(name, node)
+                    touched.add(name)
             else:
-                node.parent.set_local(asname or name, node)
-                sort_locals(node.parent.scope().locals[asname or name])
-
-    def delayed_assattr(self, node) -> None:
+                local_name = asname or name
+                set_local(local_name, node)
+                touched.add(local_name)
+        # Sort each touched locals list once after all names are inserted,
+        # instead of re-sorting a growing list on every single append.
+        for name in touched:
+            scope_locals[name].sort(key=_import_from_sort_key)
+
+    def _assattr_iattrs(self, inferred, node):
+        """Return the attribute mapping to store *node* in, or None to skip.
+
+        Dispatches on the exact type of *inferred* through a dict first: a
+        single C-level lookup replaces the two type() comparisons the old
+        if/elif cascade ran for the narrow Instance/ExceptionInstance check.
+        The isinstance branches remain as the fallback for subclasses.
+        """
+        dispatch = self._assattr_dispatch
+        if dispatch is None:
+            # pylint: disable=unidiomatic-typecheck
+            # We want a narrow check on the parent type, not all of its
+            # subclasses, hence keying on the exact types.
+            dispatch = self._assattr_dispatch = {
+                bases.Instance: _instance_iattrs,
+                objects.ExceptionInstance: _instance_iattrs,
+            }
+        handler = dispatch.get(type(inferred))
+        if handler is not None:
+            return handler(inferred, node)
+        if isinstance(inferred, bases.Instance):
+            # Const, Tuple or other containers that inherit from `Instance`
+            return None
+        if isinstance(inferred, bases.Proxy) or inferred is util.Uninferable:
+            return None
+        if inferred.is_function:
+            return inferred.instance_attrs
+        return inferred.locals
+
+    def delayed_assattr(self, node, infer_cache=None) -> None:
         """Visit a AssAttr node.
 
         This adds name to locals and handle members definition.
+
+        The optional *infer_cache* maps id(expr) to its materialized
+        inference results so repeated assattrs on one target (e.g. many
+        ``self.x = ...`` in a class) reuse a single inference walk.
         """
         try:
             frame = node.frame(future=True)
-            for inferred in node.expr.infer():
-                if inferred is util.Uninferable:
+            if infer_cache is None:
+                inferred_values = list(node.expr.infer())
+            else:
+                key = id(node.expr)
+                inferred_values = infer_cache.get(key)
+                if inferred_values is None:
+                    inferred_values = infer_cache[key] = list(node.expr.infer())
+            # Hot loop: bind everything reached through an attribute chain
+            # to locals once, so each iteration runs on plain LOAD_FAST.
+            uninferable = util.Uninferable
+            get_iattrs = self._assattr_iattrs
+            attrname = node.attrname
+            frame_is_init = frame.name == "__init__"
+            for inferred in inferred_values:
+                if inferred is uninferable:
                     continue
                 try:
-                    # pylint: disable=unidiomatic-typecheck
-                    # We want a narrow check on the parent type,
-                    # not all of its subclasses.
-                    if (
-                        type(inferred) == bases.Instance
-                        or type(inferred) == object.ExceptionInstance
-                    ):
-                        inferred = inferred._proxied
-                        iattrs = inferred.instance_attrs
-                        if not _can_assign_attr(inferred, node.attrname):
-                            continue
-                    elif isinstance(inferred, bases.Instance):
-                        # Const, Tuple or other containers that inherit from
-                        # `Instance`
-                        continue
-                    elif (
-                        isinstance(inferred, base.Proxy) or inferred is util.Uninferabel
-                    ):
-                        continue
-                    elif inferred.is_function:
-                        isattrs = inferred.instance_attrs
-                    else:
-                        iattrs = inferred.locals
+                    iattrs = get_iattrs(inferred, node)
                 except AttributeError:
                     # XXX log error
                     continue
-                values = iattrs.setdefault(node.attrname, [])
+                if iattrs is None:
+                    continue
+                values = iattrs.setdefault(attrname, [])
                 if node in values:
                     continue
                 # get assign in __init__ first XXX useful ?
                 if (
-                    frame.name == "__init__"
+                    frame_is_init
                     and values
                     and values[0].frame(future=True).name != "__init__"
                 ):
@@ -223,6 +331,11 @@ class Builder:
             pass
 
 
+def _parse_one_file(path):
+    """Worker for Builder.files_build; module-level so it pickles."""
+    return Builder(manager=Manager()).file_build(path)
+
+
 def build_namespace_package_module(name, path):
     # TODO: Typing: remove the cast to list and just update typing to accept Sequence
     return nodes.Module(name, path=list(path), package=True)
@@ -235,11 +348,28 @@ def parse(
     apply_transforms: Optional[bool] = True,
 ):
     """Parses a source string in order to obtain an astroid AST from it."""
-    code = textwrap.dedent(code)
+    code = _maybe_dedent(code)
     builder = Builder(manager=Manager(), apply_transforms=apply_transforms)
     return builder.string_build(code, modname=module_name, path=path)
 
 
+def _maybe_dedent(code: str) -> str:
+    """Dedent *code* only when its first code line is actually indented.
+
+    Source read from files is flush-left already; if the first non-blank
+    line starts at column 0 the common whitespace prefix is empty and
+    textwrap.dedent would scan the whole source twice just to return it
+    unchanged.
+    """
+    i = 0
+    n = len(code)
+    while i < n and code[i] == "\n":
+        i += 1
+    if i >= n or code[i] not in " \t":
+        return code
+    return textwrap.dedent(code)
+
+
 def _extract_expressions(node):
     """Find expressions in a call to _TRANSIENT_FUNCTION and extract them.
 
@@ -258,40 +388,103 @@ def _extract_expressions(node):
         The sequence of wrapped expressions on the modified tree
         expression can be found.
     """
-    if (
-        isinstance(node, nodes.Call)
-        and isinstance(node.func, nodes.Name)
-        and node.func.name == _TRANSIENT_FUNCTION
-    ):
-        real_expr = node.args[0]
-        assert node.parent
-        real_expr.parent = node.parent
-        # Search for node in all _astng_fields (the fields checked when
-        # get_children is called) of its parents. Some of those fields may
-        # be lists or tuples, in which case the elements need to be checked.
-        # When we find it, replace it by real_expr, so that the AST looks
-        # like no call to _TRANSIENT_FUNCTION ever took place.
-        for name in node.parent._astroid_fields:
-            child = getattr(node.parent, name)
-            if isinstance(child, list):
-                for idx, compound_child in enumerate(child):
-                    if compound_child is node:
-                        child[idx] = real_expr
-            elif child is node:
-                setattr(node.parent, name, real_expr)
-        yield real_expr
+    # Walk iteratively with an explicit stack: no Python frame per visited
+    # node and no RecursionError on deep trees. Children are pushed front
+    # so nodes are still visited in the original depth-first order.
+    stack = deque([node])
+    while stack:
+        node = stack.popleft()
+        if (
+            isinstance(node, nodes.Call)
+            and isinstance(node.func, nodes.Name)
+            and node.func.name == _TRANSIENT_FUNCTION
+        ):
+            real_expr = node.args[0]
+            assert node.parent
+            real_expr.parent = node.parent
+            # Replace node by real_expr inside its parent, so that the AST
+            # looks like no call to _TRANSIENT_FUNCTION ever took place.
+            _replace_child(node.parent, node, real_expr)
+            yield real_expr
 
-    else:
-        for child in node.get_children():
-            yield from _extract_expressions(child)
+        else:
+            stack.extendleft(reversed(tuple(node.get_children())))
 
 
-def _find_statement_by_line(node, line: int) -> None:
+def _find_selector_lines(code: str):
+    """Collect the 1-based line numbers carrying a #@ selector comment.
+
+    Streams COMMENT tokens from the tokenizer in a single lazy pass over
+    the source; malformed input that the tokenizer rejects falls back to
+    the bytes-level regex scan.
+    """
+    buf = code.encode("utf-8")
+    try:
+        return [
+            token.start[0]
+            for token in tokenize.tokenize(io.BytesIO(buf).readline)
+            if token.type == tokenize.COMMENT
+            and token.string.rstrip().endswith(_STATEMENT_SELECTOR)
+        ]
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        return [
+            buf.count(b"\n", 0, match.start()) + 1
+            for match in _STATEMENT_SELECTOR_RE.finditer(buf)
+        ]
+
+
+def _replace_child(parent, old, new):
+    """Replace *old* by *new* among the direct children of *parent*.
+
+    A child -> (field, index) map is built lazily on the parent the first
+    time one of its children is replaced and reused for later replacements,
+    turning the per-field getattr scan into a single dict lookup. The map
+    falls back to the linear _astroid_fields walk when the tree was mutated
+    behind its back. List-ness of a field is probed on the instance value
+    each time: the class-level defaults are None even for list fields, so
+    they cannot tell the two apart.
+    """
+    fields = type(parent)._astroid_fields
+    index = getattr(parent, "_child_index", None)
+    if index is None:
+        index = {}
+        for name in fields:
+            child = getattr(parent, name)
+            if isinstance(child, list):
+                for idx, compound_child in enumerate(child):
+                    index[id(compound_child)] = (name, idx)
+            else:
+                index[id(child)] = (name, None)
+        parent._child_index = index
+
+    entry = index.get(id(old))
+    if entry is not None:
+        name, idx = entry
+        if idx is None:
+            setattr(parent, name, new)
+        else:
+            getattr(parent, name)[idx] = new
+        del index[id(old)]
+        index[id(new)] = entry
+        return
+
+    # Slow path: the index is stale, rescan the fields directly.
+    for name in fields:
+        child = getattr(parent, name)
+        if isinstance(child, list):
+            for idx, compound_child in enumerate(child):
+                if compound_child is old:
+                    child[idx] = new
+        elif child is old:
+            setattr(parent, name, new)
+
+
+def _find_statement_by_line(node, line: int):
     """Extracts the statement on a specific line from an AST.
 
     If the line number of node matched line, it will be returned;
-    otherwise its children are iterated and the function is called
-    recursively.
+    otherwise its children are iterated depth-first with an explicit
+    stack, avoiding one Python frame per node and the recursion limit.
 
     Parameters
     ----------
@@ -301,22 +494,24 @@ def _find_statement_by_line(node, line: int) -> None:
     line : int
         The line number of the statement to extract.
     """
-    if isinstance(node, (node.ClassDef, nodes.FunctionDef, nodes.MatchCase)):
-        # This is an inaccuracy in the AST: the nodes that can be
-        # decorated do not carry explicit information on which line
-        # the actual definition (class/def), but .fromline seems to
-        # be close enough.
-        node_line = node.fromlineno
-    else:
-        node_line = node.lineno
-
-    if node_line == line:
-        return node
+    # Hoisted out of the loop so the tuple is built once per search.
+    decorated_types = (nodes.ClassDef, nodes.FunctionDef, nodes.MatchCase)
+    stack = deque([node])
+    while stack:
+        node = stack.popleft()
+        if isinstance(node, decorated_types):
+            # This is an inaccuracy in the AST: the nodes that can be
+            # decorated do not carry explicit information on which line
+            # the actual definition (class/def), but .fromline seems to
+            # be close enough.
+            node_line = node.fromlineno
+        else:
+            node_line = node.lineno
 
-    for child in node.get_children():
-        result = _find_statement_by_line(child, line)
-        if result:
-            return result
+        if node_line == line:
+            return node
+
+        stack.extendleft(reversed(tuple(node.get_children())))
 
     return None
 
@@ -384,15 +579,12 @@ def extract_node(code: str, module_name: str = "") -> nodes.NodeNG:
     """
 
     def _extract(node):
-        if isinstance(node):
+        if isinstance(node, nodes.Expr):
             return node.value
 
         return node
 
-    requested_lines = []
-    for idx, line in enumerate(code.splitlines()):
-        if line.strip().endswith(_STATEMENT_SELECTOR):
-            requested_lines.append(idx + 1)
+    requested_lines = _find_selector_lines(code)
 
     tree = parse(code, module_name=module_name)
     if not tree.body:
@@ -400,19 +592,22 @@ def extract_node(code: str, module_name: str = "") -> nodes.NodeNG:
 
     extracted = []
     if requested_lines:
-        extraced = [_find_statement_by_line(tree, line) for line in requested_lines]
+        extracted = [_find_statement_by_line(tree, line) for line in requested_lines]
 
     # Modifies the tree.
     extracted.extend(_extract_expressions(tree))
 
-    if not extraced:
-        extraced.append(tree.body[-1])
+    if not extracted:
+        extracted.append(tree.body[-1])
 
-    extracted = [_extract(node) for node in extracted]
-    extracted_with_none = [node for node in extracted if node is not None]
-    if len(extracted_with_none) == 1:
-        return extracted_with_none[0]
-    return extracted_with_none
+    # Unwrap and filter in a single pass rather than materializing an
+    # intermediate list of _extract results.
+    results = [
+        value for node in extracted if (value := _extract(node)) is not None
+    ]
+    if len(results) == 1:
+        return results[0]
+    return results
 
 
 def _extract_single_node(code: str, module_name: str = ""):
@@ -423,19 +618,66 @@ def _extract_single_node(code: str, module_name: str = ""):
     return ret
 
 
+# Bounded memoization of compiled ASTs keyed by source hash. Short-running
+# tools (linters, test runners, extract_node) parse the same snippet over and
+# over; a plain dict with manual LRU eviction keeps the hit path free of the
+# per-call overhead functools.lru_cache adds for tiny inputs.
+_AST_CACHE_MAX_SIZE = 512
+_ast_cache: "OrderedDict[tuple[bytes, bool], tuple[ast.Module, ParserModule]]" = (
+    OrderedDict()
+)
+
+
 def _parse_string(
     data: str, type_comments: bool = True
 ) -> tuple[ast.Module, ParserModule]:
-    parser_module = get_parser_module(type_comments=type_comments)
-    try:
-        parsed = parser_module.parse(data + "\n", type_comments=type_comments)
-    except SyntaxError as exc:
-        # If the type annotations are misplaced for some reason, we do not want
-        # to fail the entire parsing of the file, so we need to retry the parsing without
-        # type comment support.
-        if exc.args[0] != MISPLACED_TYPE_ANNOTATION_ERROR or not type_comments:
-            raise
-
-        parser_module = get_parser_module(type_comments=False)
-        parsed = parser_module.parse(data + "\n", type_comments=False)
+    buf = data.encode("utf-8")
+    if type_comments and _TYPE_COMMENT_RE.search(buf) is None:
+        # Without a single `# type:` comment in the source the misplaced
+        # type annotation retry can never trigger, so parse directly without
+        # type-comment support and skip the SyntaxError round-trip entirely.
+        type_comments = False
+    key = (hashlib.blake2b(buf).digest(), type_comments)
+    cached = _ast_cache.get(key)
+    if cached is not None:
+        _ast_cache.move_to_end(key)
+        parsed, parser_module = cached
+        # Hand out a deep copy: the rebuilder annotates the raw ast nodes,
+        # so the cached tree must stay pristine.
+        return copy.deepcopy(parsed), parser_module
+    parsed, parser_module = _parse_string_uncached(data, type_comments)
+    _ast_cache[key] = (copy.deepcopy(parsed), parser_module)
+    if len(_ast_cache) > _AST_CACHE_MAX_SIZE:
+        _ast_cache.popitem(last=False)
     return parsed, parser_module
+
+
+def _parse_string_uncached(
+    data: str, type_comments: bool = True
+) -> tuple[ast.Module, ParserModule]:
+    # The parser accepts both forms, so skip the full-copy concatenation
+    # when the source is already newline-terminated.
+    text = data if data.endswith("\n") else data + "\n"
+    if type_comments:
+        # Hot path: the default parser module wraps the stdlib compiler, so
+        # call ast.parse directly through the module-level binding instead
+        # of a Python-level method on the wrapper object.
+        global _default_parser_module
+        if _default_parser_module is None:
+            _default_parser_module = get_parser_module(type_comments=True)
+        parser_module = _default_parser_module
+        try:
+            parsed = _AST_PARSE(text, type_comments=True)
+        except SyntaxError as exc:
+            # If the type annotations are misplaced for some reason, we do
+            # not want to fail the entire parsing of the file, so we need to
+            # retry the parsing without type comment support.
+            if exc.args[0] != MISPLACED_TYPE_ANNOTATION_ERROR:
+                raise
+
+            parser_module = get_parser_module(type_comments=False)
+            parsed = parser_module.parse(text, type_comments=False)
+        return parsed, parser_module
+
+    parser_module = get_parser_module(type_comments=False)
+    return parser_module.parse(text, type_comments=False), parser_module
@@ -1,10 +1,32 @@
 """Various context related utilities, including inference and call contexts."""
 
-from contextvars import Context
-from lib2to3.pytree import Node
-from pprint import pprint
-from subprocess import call
-from typing import Dict, Optional, Sequence, Tuple
+from operator import attrgetter
+from pprint import pformat
+from typing import Optional
+
+from parser._guard import RecursionGuard, guard_key
+
+
+# Free list of recycled contexts. A context is cloned on each side of a
+# binary operation, on attribute accesses and in bind_context_to_node, so
+# reusing instances keeps allocator and GC pressure off the hot inference
+# path. Capped to bound memory.
+_CTX_POOL: list = []
+_CTX_POOL_MAX_SIZE = 256
+
+
+class _NodesInferredCounter:
+    """Mutable inference counter shared between a context and its clones.
+
+    A __slots__ attribute read is cheaper than the list-index access the
+    old one-element-list cell needed, and the counter is checked on every
+    recursive inference step.
+    """
+
+    __slots__ = ("count",)
+
+    def __init__(self) -> None:
+        self.count = 0
 
 
 class InferenceContext:
@@ -20,35 +42,64 @@ class InferenceContext:
         "callcontext",
         "boundnode",
         "extra_context",
+        "builtins",
         "_nodes_inferred",
     )
 
     max_inferred = 100
 
     def __init__(self, path=None, nodes_inferred=None):
+        self._reset(path, nodes_inferred)
+
+    def _reset(self, path=None, nodes_inferred=None):
+        """(Re)initialize every slot; shared by __init__ and the pool."""
         if nodes_inferred is None:
-            self._nodes_inferred = [0]
+            self._nodes_inferred = _NodesInferredCounter()
         else:
             self._nodes_inferred = nodes_inferred
-        self.path = path or set()
+        if path is not None:
+            self.path = path
+        else:
+            # Reuse the cleared guard of a recycled context when there is one.
+            current = getattr(self, "path", None)
+            self.path = current if current is not None else RecursionGuard()
 
         self.lookupname = None
         self.callcontext = None
         self.boundnode = None
         self.extra_context = {}
+        # Lazily resolved builtins module, threaded through inference so
+        # consumers skip the manager lookup per inferred node.
+        self.builtins = None
+
+    def recycle(self):
+        """Return this context to the free list once inference is done.
+
+        Only a context its caller created (and did not hand out) may be
+        recycled; node references are dropped eagerly so recycled
+        contexts never keep trees alive.
+        """
+        if len(_CTX_POOL) < _CTX_POOL_MAX_SIZE:
+            self.path.clear()
+            self.lookupname = None
+            self.callcontext = None
+            self.boundnode = None
+            self.extra_context = {}
+            self.builtins = None
+            _CTX_POOL.append(self)
 
     @property
     def nodes_inferred(self):
         """Number of nodes inferred in this context and all its clones/descendents.
 
-        Wrap inner value in a mutable cell to allow for mutating a class
-        variable in the presence of __slots__.
+        Wrap inner value in a mutable counter to allow for mutating a
+        shared value in the presence of __slots__.
         """
-        return self._nodes_inferred[0]
+        return self._nodes_inferred.count
 
     @nodes_inferred.setter
     def nodes_inferred(self, value):
-        self._nodes_inferred[0] = value
+        self._nodes_inferred.count = value
 
     @property
     def inferred(self):
@@ -59,6 +110,20 @@ class InferenceContext:
         """
         return _INFERENCE_CACHE
 
+    def is_empty(self) -> bool:
+        """Return True if this context carries no inference state yet.
+
+        Empty contexts are interchangeable, which lets callers collapse
+        all of them onto a single cache key.
+        """
+        return not (
+            self.path
+            or self.lookupname
+            or self.callcontext
+            or self.boundnode
+            or self.extra_context
+        )
+
     def push(self, node):
         """Push node into inference path.
 
@@ -75,12 +140,11 @@ class InferenceContext:
         ret : bool
             True if node is already in context path else False.
         """
-        name = self.lookupname
-        if (node, name) in self.path:
-            return True
-
-        self.path.add((node, name))
-        return False
+        # The (node, name) pair is packed into one int so the recursion
+        # guard hashes a single machine word instead of allocating and
+        # hashing a transient tuple on every step; the guard's single
+        # add_and_test call keeps a compiled drop-in possible.
+        return self.path.add_and_test(guard_key(node, self.lookupname))
 
     def clone(self):
         """Clone inference path.
@@ -90,18 +154,28 @@ class InferenceContext:
         so the InferenceContext will need be cloned.
         """
         # XXX copy lookupname/callcontext ?
-        clone = InferenceContext(self.path.copy(), nodes_inferred=self._nodes_inferred)
+        if _CTX_POOL:
+            clone = _CTX_POOL.pop()
+            clone._reset(self.path.copy(), nodes_inferred=self._nodes_inferred)
+        else:
+            clone = InferenceContext(
+                self.path.copy(), nodes_inferred=self._nodes_inferred
+            )
         clone.callcontext = self.callcontext
         clone.boundnode = self.boundnode
         clone.extra_context = self.extra_context
+        clone.builtins = self.builtins
         return clone
 
     def __str__(self):
-        state = (
-            f"{field}={pprint.pformat(getattr(self, field), width=80 - len(field))}"
-            for field in self.__slots__
-        )
-        return "{}({})".format(type(self).__name__, ",\n    ".join(state))
+        # One pformat invocation over a dict of all fields instead of one
+        # formatter setup per slot.
+        state = {field: getattr(self, field) for field in self.__slots__}
+        return f"{type(self).__name__}({pformat(state, width=80)})"
+
+
+# C-level extraction of the (arg, value) pair from a keyword node.
+_KEYWORD_GETTER = attrgetter("arg", "value")
 
 
 class CallContext:
@@ -111,23 +185,29 @@ class CallContext:
 
     def __init__(self, args, keywords=None, callee=None) -> None:
         self.args = args  # Call positional arguments
+        # A tuple: CallContext is allocated per inferred call site and the
+        # keywords are never mutated, so the tuple is smaller and keeps the
+        # context hashable for use in cache keys.
         if keywords:
-            arg_value_pairs = [(arg.arg, arg.value) for arg in keywords]
+            self.keywords = tuple(map(_KEYWORD_GETTER, keywords))
         else:
-            arg_value_pairs = []
-        self.keywords = arg_value_pairs  # Call keyword arguments
+            self.keywords = ()  # Call keyword arguments
         self.callee = callee  # Function being called
 
 
 def copy_context(context=None) -> InferenceContext:
-    """Clone a context if given, or return a fresh context."""
+    """Clone a context if given, or return a fresh (possibly pooled) one."""
     if context is not None:
         return context.clone()
 
+    if _CTX_POOL:
+        context = _CTX_POOL.pop()
+        context._reset()
+        return context
     return InferenceContext()
 
 
-def bind_context_to_node(context: Context, node: Node) -> InferenceContext:
+def bind_context_to_node(context: Optional[InferenceContext], node) -> InferenceContext:
     """Given a context a boundnode to retrieve the correct function name or
     attribute value with from further inference.
 
@@ -136,7 +216,7 @@ def bind_context_to_node(context: Context, node: Node) -> InferenceContext:
 
     Parameters
     ----------
-    context : Context
+    context : Optional[InferenceContext]
         Context to use.
 
     node : Node
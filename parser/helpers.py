@@ -2,16 +2,32 @@
 
 from __future__ import annotations
 
-from collections.abc import Generator
-from readline import insert_text
-from tkinter import E, INSIDE
+import functools
+import itertools
+import weakref
+
 from parser import manager
-from parser import context
-from parser.context import CallContext, InferenceContext
+from parser._guard import RecursionGuard
+from parser.context import CallContext, InferenceContext, copy_context
+
+
+@functools.lru_cache(maxsize=1)
+def _get_manager():
+    """Return the shared Manager instance, resolved exactly once."""
+    return manager.Manager()
+
+
+@functools.lru_cache(maxsize=16)
+def _build_proxy_class_cached(cls_name: str, builtins_id: int) -> nodes.ClassDef:
+    # Only a handful of proxy names ever occur (function, method, module,
+    # builtin_function_or_method, ...), so each one is built a single time;
+    # builtins_id separates proxies built against different builtins
+    # modules. The parent link is (re)attached by _build_proxy_class.
+    return raw_building.build_class(cls_name)
 
 
 def _build_proxy_class(cls_name: str, builtins: nodes.Module) -> nodes.ClassDef:
-    proxy = raw_building.build_class(cls_name)
+    proxy = _build_proxy_class_cached(cls_name, id(builtins))
     proxy.parent = builtins
     return proxy
 
@@ -29,31 +45,93 @@ def _function_type(function, builtins):
     return _build_proxy_class(cls_name, builtins)
 
 
+def _type_of_classdef(inferred, builtins, context):
+    if inferred.newstyle:
+        metaclass = inferred.metaclass(context=context)
+        if metaclass:
+            return metaclass
+    return builtins.getattr("type")[0]
+
+
+def _type_of_function(inferred, builtins, context):
+    return _function_type(inferred, builtins)
+
+
+def _type_of_module(inferred, builtins, context):
+    return _build_proxy_class("module", builtins)
+
+
+def _type_of_unknown(inferred, builtins, context):
+    raise InferenceError(node=inferred)
+
+
+def _type_of_proxy(inferred, builtins, context):
+    return inferred._proxied
+
+
+# Handler table for _object_type keyed on the inferred node's type; built
+# lazily since the node classes are resolved at runtime. Concrete subtypes
+# are memoized into the table on first resolution (see _object_type).
+_object_type_dispatch = None
+
+
+def _build_object_type_dispatch():
+    return {
+        scoped_nodes.ClassDef: _type_of_classdef,
+        scoped_nodes.Lambda: _type_of_function,
+        bases.UnboundMethod: _type_of_function,
+        scoped_nodes.Module: _type_of_module,
+        nodes.Unknown: _type_of_unknown,
+        bases.Proxy: _type_of_proxy,
+        nodes.Slice: _type_of_proxy,
+    }
+
+
 def _object_type(node, context=None):
-    ast_manager = manager.Manager()
-    builtins = ast_manager.builtins_module
+    global _object_type_dispatch
+    dispatch = _object_type_dispatch
+    if dispatch is None:
+        dispatch = _object_type_dispatch = _build_object_type_dispatch()
     context = context or InferenceContext()
+    # Resolve builtins through the context: clones inherit it, so a whole
+    # inference run pays the manager lookup once.
+    builtins = context.builtins
+    if builtins is None:
+        builtins = context.builtins = _get_manager().builtins_module
 
     for inferred in node.infer(context=context):
-        if isinstance(inferred, scope_nodes.ClassDef):
-            if inferred.newstyle:
-                metaclass = inferred.metaclass(context=context)
-                if metaclass:
-                    yield metaclass
-                    continue
-            yield builtins.getattr("type")[0]
-        elif isinstance(inferred, (scoped_nodes.Lambda, bases.UnboundMethod)):
-            yield _function_type(inferred, builtins)
-        elif isinstance(inferred, scoped_nodes.Module):
-            yield _build_proxy_class("module", builtins)
-        elif isinstance(inferred, nodes.Unknown):
-            raise InferenceContext
-        elif inferred is util.Uninferable:
+        if inferred is util.Uninferable:
             yield inferred
-        elif isinstance(inferred, (bases.Proxy, nodes.Slice)):
-            yield inferred._proxied
-        else:
-            raise AssertionError(f"We don't handle {type(inferred)} currently")
+            continue
+        cls = type(inferred)
+        handler = dispatch.get(cls)
+        if handler is None:
+            # Resolve through the MRO once and memoize the handler on the
+            # concrete type, so the next value of this type is a single
+            # dict lookup instead of an isinstance cascade.
+            for base_cls in cls.__mro__:
+                handler = dispatch.get(base_cls)
+                if handler is not None:
+                    break
+            else:
+                raise AssertionError(f"We don't handle {cls} currently")
+            dispatch[cls] = handler
+        yield handler(inferred, builtins, context)
+
+
+# Memoized object_type results; inference dominates runtime and repeated
+# type queries for the same node are the norm. Weakly keyed on the node so
+# discarded trees stay collectable and a reclaimed id cannot alias a new
+# node; only context-free queries are stored (see object_type).
+_object_type_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# Marker for "no type seen yet" in object_type's ambiguity walk.
+_SENTINEL = object()
+
+
+def clear_object_type_cache() -> None:
+    """Drop all memoized object_type results."""
+    _object_type_cache.clear()
 
 
 def object_type(node, context=None):
@@ -65,13 +143,64 @@ def object_type(node, context=None):
     The node will be inferred first, so this function call support all
     sorts of objects, as long as they support inference.
     """
+    # Only context-free queries are memoized: pooled contexts are recycled
+    # and reused with the same id, so a stateful context cannot key a cache
+    # safely. All empty contexts are interchangeable with None, collapsing
+    # them onto the node-only entry.
+    cacheable = context is None or context.is_empty()
+    if cacheable:
+        try:
+            return _object_type_cache[node]
+        except (KeyError, TypeError):
+            pass
+
+    owned = None
+    if context is None:
+        context = owned = copy_context()
+    # Walk the inferred types with an early exit: once a second distinct
+    # type shows up the answer is fixed at Uninferable, so there is no
+    # point exhausting the inference generator or building a set.
+    result = util.Uninferable
+    first = _SENTINEL
     try:
-        types = set(_object_type(node, context))
+        for inferred in _object_type(node, context):
+            if first is _SENTINEL:
+                first = inferred
+            elif inferred is not first:
+                break
+        else:
+            if first is not _SENTINEL:
+                result = first
     except InferenceError:
-        return util.Uninferable
-    if len(types) > 1 or not types:
-        return util.Uninferable
-    return list(types)[0]
+        pass
+    if owned is not None:
+        owned.recycle()
+
+    if cacheable:
+        try:
+            _object_type_cache[node] = result
+        except TypeError:
+            # Nodes without weakref support simply go uncached.
+            pass
+    return result
+
+
+# MRO identity sets, weakly keyed on the class node so discarded trees
+# stay collectable; an lru_cache here would pin class nodes (and their
+# whole modules) for the process lifetime.
+_mro_id_sets: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _mro_id_set(klass):
+    """Identity set of a class's MRO; the MRO never changes during a run."""
+    try:
+        return _mro_id_sets[klass]
+    except KeyError:
+        pass
+    except TypeError:
+        return frozenset(map(id, klass.mro()))
+    mro_ids = _mro_id_sets[klass] = frozenset(map(id, klass.mro()))
+    return mro_ids
 
 
 def _object_type_is_subclass(obj_type, class_or_seq, context=None):
@@ -92,13 +221,13 @@ def _object_type_is_subclass(obj_type, class_or_seq, context=None):
     # issubclass(type, (object, 1)) evaluates to True
     # issubclass(object, (1, type)) raises TypeError
     for klass in class_seq:
-        if klass in util.Uninferable:
+        if klass is util.Uninferable:
             raise TypeError("arg 2 must be a type or tuple of types")
 
-        for obj_subclass in obj_type.mro():
-            if obj_subclass == klass:
-                return True
-    return False
+    # Membership runs against a cached identity set of the MRO, collapsing
+    # the old O(|mro| * |seq|) Python comparison loop into C-level probes.
+    mro_ids = _mro_id_set(obj_type)
+    return any(id(klass) in mro_ids for klass in class_seq)
 
 
 def object_isinstance(node, class_or_seq, context=None):
@@ -157,45 +286,69 @@ def safe_infer(node, context=None):
     Return None if inference failed or if there is some ambiguity (more than
     one node has been inferre).
     """
+    # Pull at most two results through C-level islice: one try block and
+    # one list instead of the double next()/StopIteration dance.
     try:
-        inferit = node.infer(context=context)
-        value = next(inferit)
-    except (InferenceError, StopIteration):
-        return None
-    try:
-        next(inferit)
-        return None  # None if there is ambiguity on the inferred node
+        results = list(itertools.islice(node.infer(context=context), 2))
     except InferenceError:
-        return None  # There is some kind of ambiguity
-    except StopIteration:
-        return value
+        return None
+    return results[0] if len(results) == 1 else None
+
+
+# Classes whose whole base hierarchy already inferred successfully. The
+# positive answer never changes during a run, so it is shared across all
+# contexts; weak references keep discarded trees collectable.
+_KNOWN_BASES: weakref.WeakSet = weakref.WeakSet()
 
 
-def has_known_bases(klass, context=None):
-    """Return True if all base classes of a class could be inferred."""
+def has_known_bases(klass, context=None, seen=None):
+    """Return True if all base classes of a class could be inferred.
+
+    *seen* carries the classes on the current recursion stack so
+    A->B->A cycles (and re-descent into shared diamond bases) are cut
+    off with one guard probe instead of blowing the recursion limit.
+    """
+    if klass in _KNOWN_BASES:
+        return True
     try:
         return klass._all_bases_known
     except AttributeError:
         pass
+    if seen is None:
+        seen = RecursionGuard()
+    if seen.add_and_test(id(klass)):
+        return False
     for base in klass.bases:
-        result = safe_infer(result, context=context)
-        # TODO: check for A->B->A->B pattern in class structure too?
+        result = safe_infer(base, context=context)
         if (
             not isinstance(result, scope_nodes.ClassDef)
             or result is klass
-            or not has_known_bases(result, context=context)
+            or not has_known_bases(result, context=context, seen=seen)
         ):
             klass._all_bases_known = False
             return False
     klass._all_bases_known = True
+    _KNOWN_BASES.add(klass)
     return True
 
 
-def _type_check(type1, type2):
+# Memoized subtype answers, tied to node lifetime through two levels of
+# weak keys (mirroring _mro_id_sets): an entry dies with either of its
+# class nodes, so a reclaimed id can never alias a new node onto a stale
+# answer the way an id-pair memo would.
+_type_check_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def clear_type_check_cache() -> None:
+    """Drop all memoized subtype answers."""
+    _type_check_cache.clear()
+
+
+def _type_check_uncached(type1, type2):
     if not all(map(has_known_bases, (type1, type2))):
         raise _NonDeducibleTypeHierarchy
 
-    if not all(type1.newstyle, type2.newstyle):
+    if not (type1.newstyle and type2.newstyle):
         return False
     try:
         return type1 in type2.mro()[:-1]
@@ -204,6 +357,26 @@ def _type_check(type1, type2):
         raise _NonDeducibleTypeHierarchy from e
 
 
+def _type_check(type1, type2):
+    # is_subtype answers do not change within a run, so they are memoized
+    # per node pair; _NonDeducibleTypeHierarchy escapes uncached and is
+    # simply recomputed on the next query.
+    try:
+        per_type1 = _type_check_cache[type1]
+    except KeyError:
+        per_type1 = _type_check_cache[type1] = weakref.WeakKeyDictionary()
+    except TypeError:
+        return _type_check_uncached(type1, type2)
+    try:
+        return per_type1[type2]
+    except KeyError:
+        pass
+    except TypeError:
+        return _type_check_uncached(type1, type2)
+    result = per_type1[type2] = _type_check_uncached(type1, type2)
+    return result
+
+
 def is_subtype(type1, type2):
     """Check if *type1* is a subtype of *type2*."""
     return _type_check(type1=type2, type2=type1)
@@ -221,7 +394,7 @@ def class_instance_as_index(node):
     be used in some scenarios where an integer is expected,
     for instance when multiplying or subscripting a list.
     """
-    context = InferenceContext()
+    context = copy_context()
     try:
         for inferred in node.igetattr("__index__", context=context):
             if not isinstance(inferred, bases.BoundMethod):
@@ -235,9 +408,41 @@ def class_instance_as_index(node):
 
     except InferenceError:
         pass
+    finally:
+        context.recycle()
     return None
 
 
+# Length extractors for the container nodes whose size is directly known,
+# keyed on the exact node type; built lazily because FrozenSet comes from
+# the circular parser.objects import. See object_len.
+_len_extractors = None
+
+
+def _build_len_extractors():
+    FrozenSet = _get_frozenset()
+    return {
+        nodes.List: lambda n: len(n.elts),
+        nodes.Tuple: lambda n: len(n.elts),
+        nodes.Set: lambda n: len(n.elts),
+        FrozenSet: lambda n: len(n.elts),
+        nodes.Dict: lambda n: len(n.items),
+    }
+
+
+@functools.lru_cache(maxsize=1)
+def _get_frozenset():
+    """Resolve objects.FrozenSet once, dodging the circular import.
+
+    The inline import in object_len paid the sys.modules probe of the
+    import machinery on every call; this resolves it a single time.
+    """
+    # pylint: disable=import-outside-toplevel; circular import
+    from parser.objects import FrozenSet
+
+    return FrozenSet
+
+
 def object_len(node, context=None):
     """Infer length of given node object.
 
@@ -254,8 +459,10 @@ def object_len(node, context=None):
     ret : int
         Integer length of node.
     """
-    # pylint: disable=import-outside-toplevel; circular import
-    from parser.objects import FrozenSet
+    global _len_extractors
+    extractors = _len_extractors
+    if extractors is None:
+        extractors = _len_extractors = _build_len_extractors()
 
     inferred_node = safe_infer(node, context=context)
     node_frame = node.frame(future=True)
@@ -275,14 +482,15 @@ def object_len(node, context=None):
 
     if inferred_node is None or inferred_node is util.Uninferable:
         raise InferenceError(node=node)
+    # Common container case: one dict lookup on the exact type instead of
+    # a run of failed isinstance tests.
+    extractor = extractors.get(type(inferred_node))
+    if extractor is not None:
+        return extractor(inferred_node)
     if isinstance(inferred_node, nodes.Const) and isinstance(
         inferred_node.value, (bytes, str)
     ):
         return len(inferred_node.value)
-    if isinstance(inferred_node, (nodes.List, node.Set, nodes.Tuple, FrozenSet)):
-        return len(inferred_node.elts)
-    if isinstance(inferred_node, nodes.Dict):
-        return len(inferred_node.items)
 
     node_type = object_type(inferred_node, context=context)
     if not node_type:
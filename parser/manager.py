@@ -1,9 +1,64 @@
-from msilib.schema import Class
-from operator import mod
+import atexit
+import os
+import pickle
+import shelve
+import sys
+import types
+
 from sysconfig import is_python_build
 from typing import ClassVar
 from unittest.util import safe_repr
 
+from parser.context import InferenceContext
+
+
+# Opt-in persistent AST cache, keyed on (path, mtime, size, interpreter).
+# Enabled by setting this variable to "1"; see _get_disk_cache.
+_DISK_CACHE_ENV = "AST_PARSER_DISK_CACHE"
+_disk_cache = None
+# Set in ast_from_files pool workers: the dbm file behind shelve is
+# single-writer, so only the parent process may open it.
+_disk_cache_disabled = False
+
+
+def _get_disk_cache():
+    """Open the on-disk AST cache lazily, when enabled via the environment.
+
+    Unchanged files then skip lexing/parsing entirely across process
+    starts, trading one stat per file for the full build cost.
+    """
+    global _disk_cache, _disk_cache_disabled
+    if _disk_cache_disabled:
+        return None
+    if _disk_cache is None and os.environ.get(_DISK_CACHE_ENV) == "1":
+        cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "ast-parser")
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            _disk_cache = shelve.open(
+                os.path.join(cache_dir, "modules"), protocol=pickle.HIGHEST_PROTOCOL
+            )
+        except OSError:
+            # Locked by another process (gdbm is exclusive) or the file is
+            # unreadable/corrupt: degrade to uncached builds for this run.
+            _disk_cache_disabled = True
+            return None
+        # dbm backends buffer writes and only guarantee a consistent file
+        # on close, so the shelve must be closed at interpreter exit.
+        atexit.register(_disk_cache.close)
+    return _disk_cache
+
+
+def _build_one_file(filepath):
+    """Worker for Manager.ast_from_files; module-level so it pickles.
+
+    The disk cache is forced off here: dbm backends are single-writer,
+    so concurrent shelve.open calls from workers would fail or corrupt
+    the file. Only the parent process touches the cache.
+    """
+    global _disk_cache_disabled
+    _disk_cache_disabled = True
+    return Manager().ast_from_file(filepath)
+
 
 class Manager:
     """Responsible to build ast from files or modules.
@@ -11,27 +66,32 @@ class Manager:
     Use the singleton pattern.
     """
 
+    # All state is shared by class identity: the manager is a singleton,
+    # so the per-instance copies out of the old brain dict were pure
+    # construction overhead. Empty __slots__ keeps instances dict-free
+    # and routes attribute reads through the class descriptor fast path.
+    __slots__ = ()
+
     name = "ast loader"
-    brain = {
-        "ast_cache": {},
-        "_mod_file_cache": {},
-        "_failed_import_hooks": [],
-        "always_load_extensions": False,
-        "optimize_ast": False,
-        "extension_package_whitelist": set(),
-        "_transform": TransformVisitor(),
-    }
+    # NOTE: cache entries are added by the [re]builder
+    ast_cache: ClassVar[dict] = {}
+    _mod_file_cache: ClassVar[dict] = {}
+    _failed_import_hooks: ClassVar[list] = []
+    always_load_extensions: ClassVar[bool] = False
+    optimize_ast: ClassVar[bool] = False
+    extension_package_whitelist: ClassVar[set] = set()
+    _transform = TransformVisitor()
     max_inferable_values: ClassVar[int] = 100
 
-    def __init__(self) -> None:
-        # NOTE: cache entries are added by the [re]builder
-        self.ast_cache = Manager.brain["ast_cache"]
-        self._mod_file_cache = Manager.brain["_mod_file_cache"]
-        self._failed_import_hooks = Manager.brain["_failed_import_hooks"]
-        self.always_load_extensions = Manager.brain["always_load_extensions"]
-        self.optimize_ast = Manager.brain["optimize_ast"]
-        self.extention_package_whitelist = Manager.brain["extention_package_whitelist"]
-        self._transform = Manager.brain["_transform"]
+    _instance = None
+
+    def __new__(cls):
+        # Manager() is called on hot paths (one per type query during
+        # inference), so the singleton is cached here and construction
+        # collapses to a single attribute load.
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
 
     @property
     def register_transform(self):
@@ -63,20 +123,77 @@ class Manager:
                 modname = ".".join(modpath_from_file(filepath))
             except ImportError:
                 modname = filepath
+        # Interned names hash by pointer identity in the cache dict probes.
+        modname = sys.intern(modname)
         if modname in self.ast_cache and self.ast_cache[modname].file == filepath:
             return self.ast_cache[modname]
         if source:
+            disk_cache = _get_disk_cache()
+            key = None
+            if disk_cache is not None:
+                try:
+                    stat = os.stat(filepath)
+                except OSError:
+                    pass
+                else:
+                    # mtime/size-aware invalidation; the interpreter version
+                    # is part of the key since the pickled tree is not
+                    # portable across it.
+                    key = repr(
+                        (
+                            filepath,
+                            stat.st_mtime_ns,
+                            stat.st_size,
+                            tuple(sys.version_info),
+                        )
+                    )
+                    module = disk_cache.get(key)
+                    if module is not None:
+                        self.ast_cache[modname] = module
+                        return module
             # pylint: disable=import-outside-toplevel; circular import
             from parser.builder import Builder
 
-            return Builder(self).file_build(filepath, modname)
+            module = Builder(self).file_build(filepath, modname)
+            if key is not None:
+                try:
+                    disk_cache[key] = module
+                except (pickle.PicklingError, TypeError, AttributeError):
+                    # Not every tree pickles; the disk cache is best-effort.
+                    pass
+            return module
         if fallback and modname:
             return self.ast_from_module_name(modname)
         raise ValueError("Unable to build an AST for {path}.", path=filepath)
 
+    def ast_from_files(self, paths, workers=None):
+        """Build asts for several independent files on a process pool.
+
+        Each file's build is embarrassingly parallel, so the paths are
+        fanned out over worker processes and the returned modules are
+        ingested into this manager's ast_cache serially. The disk cache
+        is disabled in the workers (its dbm file is single-writer), so
+        only serial builds in the parent read or populate it. Small
+        batches skip the pool since its spin-up would dominate. Returns
+        a dict mapping each path to its built module.
+        """
+        paths = list(paths)
+        if len(paths) < 4:
+            return {path: self.ast_from_file(path) for path in paths}
+        # pylint: disable=import-outside-toplevel; keep startup lean
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            modules = dict(
+                zip(paths, executor.map(_build_one_file, paths, chunksize=8))
+            )
+        for module in modules.values():
+            self.ast_cache[sys.intern(module.name)] = module
+        return modules
+
     def ast_from_module(self, module: types.ModuleType, modname: str = None):
         """Given an imported module, return the ast object."""
-        modname = modname or module.__name__
+        modname = sys.intern(modname or module.__name__)
         if modname in self.ast_cache:
             return self.ast_cache[modname]
         try:
@@ -106,12 +223,16 @@ class Manager:
                     class_repr=safe_repr(klass),
                     modname=modname,
                 ) from exc
-        modast = self.ast_from_module_name(modname)
+        modast = self.ast_from_module_name(sys.intern(modname))
         ret = modast.getattr(klass.__name__)[0]
         assert isinstance(ret, nodes.ClassDef)
         return ret
 
     def file_from_module_name(self, modname: str, contextfile: str = None):
+        # The same dotted name is rebuilt by callers on every lookup;
+        # interning restores the string-identity fast path when probing
+        # (and reusing) the cache key below.
+        modname = sys.intern(modname)
         try:
             value = self._mod_file_cache[(modname, contextfile)]
         except KeyError: